@@ -1,7 +1,19 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from scipy.integrate import solve_ivp
+from numba import njit, cfunc, carray, prange, types
+from numbalsoda import lsoda
+
+# JAX is optional; when installed it provides an XLA-compiled Dormand-Prince integrator
+try:
+    import jax
+    import jax.numpy as jnp
+    from jax.experimental.ode import odeint as jax_odeint
+    jax.config.update('jax_enable_x64', True)
+except ImportError:
+    jax = None
 
 # Set up the Streamlit app
 st.title('Epidemiological Vaccination Model')
@@ -12,72 +24,93 @@ You can adjust various parameters to explore different scenarios and understand
 disease spread, vaccination, and recovery.
 This model is inspired by real-world epidemiological studies
 and is tailored to provide insights into managing infectious diseases.
-Use the sidebar to input your desired parameters and observe how they affect the susceptible,
-vaccinated, carrier, infected, recovered populations, and the misinformation index.
+Use the sidebar to input your desired parameters, press *Run Simulation*, and observe how they affect
+the susceptible, vaccinated, carrier, infected, recovered populations, and the misinformation index.
 """)
 
-# Sidebar for parameters
-st.sidebar.header('Model Parameters')
-st.sidebar.markdown("""
+# Sidebar for parameters, grouped in a form so edits are applied together in a single rerun
+with st.sidebar.form('params'):
+    st.header('Model Parameters')
+    st.markdown("""
 Adjust the parameters below to simulate different scenarios. These parameters influence the disease
 dynamics, vaccination effectiveness, and public perception.
 """)
-Lambda = st.sidebar.number_input('Total Population (Lambda)', value=186121000, min_value=1000,
-                                 help="Total population size.")
-mu = st.sidebar.number_input('Natural Mortality Rate (mu)', value=1/70, min_value=0.0,
-                             max_value=1.0, help="Rate at which individuals naturally die.")
-beta = st.sidebar.number_input('Transmission Rate (beta)', value=0.3, min_value=0.0, max_value=1.0,
-                               help="Rate at which the disease spreads.")
-epsilon = st.sidebar.number_input('Modification Factor (epsilon)', value=1.0,
-                                  min_value=0.0,  # Added min_value for completeness
-                                  max_value=10.0, help="Factor modifying transmission rate due to carriers.")
-p0 = st.sidebar.number_input('Base Vaccination Rate (p0)', value=0.01,
-                             min_value=0.0,
-                             max_value=1.0, help="Baseline rate of vaccination.")
-pmax = st.sidebar.number_input('Max Vaccination Rate (pmax)', value=0.05,
-                               min_value=0.0,
-                               max_value=1.0, help="Maximum rate of vaccination based on public awareness.")
-D = st.sidebar.number_input('Reactivity Factor (D)', value=5000, min_value=0, help="Factor determining public reactivity to the disease.")
-psi = st.sidebar.number_input('Vaccine Effectiveness (psi)', value=0.9, min_value=0.0, max_value=1.0,
-                              help="Effectiveness of the vaccine.")
-theta = st.sidebar.number_input('Waning Rate of Vaccine-Induced Immunity (theta)', value=1/365,
-                                min_value=0.0, max_value=1.0, help="Rate at which vaccine-induced immunity wanes.")
-sigma = st.sidebar.number_input('Rate of Symptom Development (sigma)', value=0.01, min_value=0.0,
-                                max_value=1.0, help="Rate at which carriers develop symptoms.")
-delta = st.sidebar.number_input('Recovery Rate for Carriers (delta)', value=1/14, min_value=0.0,
-                                max_value=1.0, help="Rate at which carriers recover.")
-rho = st.sidebar.number_input('Recovery Rate for Ill (rho)', value=1/10, min_value=0.0,
-                              max_value=1.0, help="Rate at which infected individuals recover.")
-d = st.sidebar.number_input('Disease-Induced Mortality Rate (d)', value=1/1000, min_value=0.0,
-                            max_value=1.0, help="Mortality rate due to the disease.")
-phi = st.sidebar.number_input('Waning Rate of Natural Immunity (phi)', value=1/365, min_value=0.0,
-                              max_value=1.0, help="Rate at which natural immunity wanes.")
-k = st.sidebar.number_input('Information Coverage (k)', value=0.5, min_value=0.0, max_value=1.0,
-                            help="Extent of information coverage about the disease.")
-a = st.sidebar.number_input('Characteristic Memory Length (a)', value=1/30, min_value=0.0,
-                            max_value=1.0, help="Memory length affecting public response to the disease.")
-alpha_gamma = st.sidebar.number_input('Growth Rate for Healthcare Access (alpha_gamma)',
-                                      value=0.01, min_value=0.0, max_value=1.0, help="Rate at which access to healthcare improves.")
-beta_gamma = st.sidebar.number_input('Reduction Rate for Healthcare Access (beta_gamma)',
-                                     value=0.005, min_value=0.0, max_value=1.0, help="Rate at which healthcare access is reduced.")
-alpha_eta = st.sidebar.number_input('Growth Rate for Social Influence (alpha_eta)', value=0.02,
-                                    min_value=0.0, max_value=1.0, help="Rate at which social influence grows.")
-beta_eta = st.sidebar.number_input('Reduction Rate for Social Influence (beta_eta)', value=0.01,
-                                   min_value=0.0, max_value=1.0, help="Rate at which social influence wanes.")
-alpha_xi = st.sidebar.number_input('Growth Rate of Misinformation (alpha_xi)', value=0.005,
-                                   min_value=0.0, max_value=1.0, help="Rate at which misinformation spreads.")
-beta_xi = st.sidebar.number_input('Reduction Rate of Misinformation (beta_xi)', value=0.002,
-                                  min_value=0.0, max_value=1.0, help="Rate at which misinformation is countered.")
-
-# Initial conditions
-st.sidebar.header('Initial Conditions')
-st.sidebar.markdown("Set the initial population distribution among the different groups.")
-initial_infected = st.sidebar.number_input('Initial Infected Population', value=1000, min_value=0,
-                                           max_value=Lambda, help="Initial number of infected individuals.")
-initial_vaccinated = st.sidebar.number_input('Initial Vaccinated Population', value=10000000,
-                                             min_value=0, max_value=Lambda, help="Initial number of vaccinated individuals.")
-initial_carriers = st.sidebar.number_input('Initial Carriers Population', value=5000, min_value=0,
-                                           max_value=Lambda, help="Initial number of carriers.")
+    Lambda = st.number_input('Total Population (Lambda)', value=186121000, min_value=1000,
+                             help="Total population size.")
+    mu = st.number_input('Natural Mortality Rate (mu)', value=1/70, min_value=0.0,
+                         max_value=1.0, help="Rate at which individuals naturally die.")
+    beta = st.number_input('Transmission Rate (beta)', value=0.3, min_value=0.0, max_value=1.0,
+                           help="Rate at which the disease spreads.")
+    epsilon = st.number_input('Modification Factor (epsilon)', value=1.0,
+                              min_value=0.0,  # Added min_value for completeness
+                              max_value=10.0, help="Factor modifying transmission rate due to carriers.")
+    p0 = st.number_input('Base Vaccination Rate (p0)', value=0.01,
+                         min_value=0.0,
+                         max_value=1.0, help="Baseline rate of vaccination.")
+    pmax = st.number_input('Max Vaccination Rate (pmax)', value=0.05,
+                           min_value=0.0,
+                           max_value=1.0, help="Maximum rate of vaccination based on public awareness.")
+    D = st.number_input('Reactivity Factor (D)', value=5000, min_value=0, help="Factor determining public reactivity to the disease.")
+    psi = st.number_input('Vaccine Effectiveness (psi)', value=0.9, min_value=0.0, max_value=1.0,
+                          help="Effectiveness of the vaccine.")
+    theta = st.number_input('Waning Rate of Vaccine-Induced Immunity (theta)', value=1/365,
+                            min_value=0.0, max_value=1.0, help="Rate at which vaccine-induced immunity wanes.")
+    sigma = st.number_input('Rate of Symptom Development (sigma)', value=0.01, min_value=0.0,
+                            max_value=1.0, help="Rate at which carriers develop symptoms.")
+    delta = st.number_input('Recovery Rate for Carriers (delta)', value=1/14, min_value=0.0,
+                            max_value=1.0, help="Rate at which carriers recover.")
+    rho = st.number_input('Recovery Rate for Ill (rho)', value=1/10, min_value=0.0,
+                          max_value=1.0, help="Rate at which infected individuals recover.")
+    d = st.number_input('Disease-Induced Mortality Rate (d)', value=1/1000, min_value=0.0,
+                        max_value=1.0, help="Mortality rate due to the disease.")
+    phi = st.number_input('Waning Rate of Natural Immunity (phi)', value=1/365, min_value=0.0,
+                          max_value=1.0, help="Rate at which natural immunity wanes.")
+    k = st.number_input('Information Coverage (k)', value=0.5, min_value=0.0, max_value=1.0,
+                        help="Extent of information coverage about the disease.")
+    a = st.number_input('Characteristic Memory Length (a)', value=1/30, min_value=0.0,
+                        max_value=1.0, help="Memory length affecting public response to the disease.")
+    alpha_gamma = st.number_input('Growth Rate for Healthcare Access (alpha_gamma)',
+                                  value=0.01, min_value=0.0, max_value=1.0, help="Rate at which access to healthcare improves.")
+    beta_gamma = st.number_input('Reduction Rate for Healthcare Access (beta_gamma)',
+                                 value=0.005, min_value=0.0, max_value=1.0, help="Rate at which healthcare access is reduced.")
+    alpha_eta = st.number_input('Growth Rate for Social Influence (alpha_eta)', value=0.02,
+                                min_value=0.0, max_value=1.0, help="Rate at which social influence grows.")
+    beta_eta = st.number_input('Reduction Rate for Social Influence (beta_eta)', value=0.01,
+                               min_value=0.0, max_value=1.0, help="Rate at which social influence wanes.")
+    alpha_xi = st.number_input('Growth Rate of Misinformation (alpha_xi)', value=0.005,
+                               min_value=0.0, max_value=1.0, help="Rate at which misinformation spreads.")
+    beta_xi = st.number_input('Reduction Rate of Misinformation (beta_xi)', value=0.002,
+                              min_value=0.0, max_value=1.0, help="Rate at which misinformation is countered.")
+
+    # Initial conditions
+    st.header('Initial Conditions')
+    st.markdown("Set the initial population distribution among the different groups.")
+    initial_infected = st.number_input('Initial Infected Population', value=1000, min_value=0,
+                                       max_value=Lambda, help="Initial number of infected individuals.")
+    initial_vaccinated = st.number_input('Initial Vaccinated Population', value=10000000,
+                                         min_value=0, max_value=Lambda, help="Initial number of vaccinated individuals.")
+    initial_carriers = st.number_input('Initial Carriers Population', value=5000, min_value=0,
+                                       max_value=Lambda, help="Initial number of carriers.")
+
+    # Solver
+    st.header('Solver')
+    methods = ['RK4', 'LSODA'] + (['DOPRI5 (JAX)'] if jax is not None else [])
+    method = st.selectbox('Integrator', methods,
+                          help="RK4 takes fixed one-day steps and is fastest for smooth scenarios; "
+                               "LSODA adapts its step size and handles stiff parameter choices; "
+                               "DOPRI5 (JAX) is an adaptive integrator compiled with XLA "
+                               "(available when JAX is installed).")
+
+    # Sensitivity analysis
+    st.header('Sensitivity Analysis')
+    show_sensitivity = st.checkbox('Show sensitivity bands', value=False,
+                                   help="Re-solve the model for many randomly perturbed parameter sets.")
+    variation = st.slider('Parameter Variation (%)', min_value=1, max_value=50, value=10,
+                          help="Maximum relative perturbation applied to each parameter.")
+    n_samples = st.number_input('Number of Samples', value=200, min_value=10, max_value=5000, step=10,
+                                help="Number of perturbed parameter sets to solve.")
+
+    st.form_submit_button('Run Simulation')
 
 # Derived initial conditions
 S0 = Lambda - initial_infected - initial_vaccinated - initial_carriers
@@ -90,42 +123,301 @@ gamma0 = 0.8
 eta0 = 0.2
 xi0 = 0.05
 
-# Time span
-tspan = np.linspace(0, 365, 365)
+# Time span, one point per day. Built once per process and shared read-only across reruns;
+# st.cache_resource hands back the same array rather than a fresh copy on every call.
+@st.cache_resource
+def get_tspan(n_days):
+    tspan = np.arange(0.0, n_days + 1.0)
+    tspan.flags.writeable = False
+    return tspan
+
+n_days = 365
+tspan = get_tspan(n_days)
 
 # ODE function
-def vaccination_model_dynamic(Y, t, params):
-    S, V, C, I, R, M, gamma, eta, xi = Y
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _rhs(Y, t, Lambda, mu, beta, epsilon, p0, pmax, D, psi, theta, sigma, delta, rho, d, phi, k, a,
+         alpha_gamma, beta_gamma, alpha_eta, beta_eta, alpha_xi, beta_xi,
+         sdm, rmd, pm, tm, one_minus_psi, dp, out):
+    S, V, C, I, R, M, gamma, eta, xi = Y[0], Y[1], Y[2], Y[3], Y[4], Y[5], Y[6], Y[7], Y[8]
+
+    # float32 literal so single-precision inputs are not promoted to double
+    one = np.float32(1.0)
+
+    N = S + V + C + I + R
+    inv_N = one / N
+    p_effective = gamma * (p0 + dp * D * M / (one + D * M))
+    force = beta * (epsilon * C + I) * inv_N
+
+    out[0] = Lambda - force * S - p_effective * S + theta * V + phi * R - mu * S
+    out[1] = p_effective * S - one_minus_psi * force * V - tm * V
+    out[2] = force * (S + one_minus_psi * V) - sdm * C
+    out[3] = sigma * C - rmd * I
+    out[4] = delta * C + rho * I - pm * R
+    out[5] = a * (k * I / Lambda - M) + eta * M - xi * M
+    out[6] = (alpha_gamma * S - beta_gamma * I) * inv_N
+    out[7] = (alpha_eta * V - beta_eta * M) * inv_N
+    out[8] = alpha_xi * M - beta_xi * V * inv_N
+
+    return out
+
+@njit(cache=True, fastmath=True)
+def _jac(Y, t, Lambda, mu, beta, epsilon, p0, pmax, D, psi, theta, sigma, delta, rho, d, phi, k, a,
+         alpha_gamma, beta_gamma, alpha_eta, beta_eta, alpha_xi, beta_xi,
+         sdm, rmd, pm, tm, one_minus_psi, dp):
+    S, V, C, I, R, M, gamma, eta, xi = Y[0], Y[1], Y[2], Y[3], Y[4], Y[5], Y[6], Y[7], Y[8]
+
+    N = S + V + C + I + R
+    q = p0 + dp * D * M / (1 + D * M)
+    dq_dM = dp * D / ((1 + D * M) * (1 + D * M))
+    p_effective = gamma * q
+    force = beta * (epsilon * C + I) / N
+
+    # Partial derivatives of the force of infection w.r.t. S, V, C, I, R
+    dforce = np.full(5, -force / N)
+    dforce[2] = (beta * epsilon - force) / N
+    dforce[3] = (beta - force) / N
+
+    J = np.zeros((9, 9))
+    for j in range(5):
+        J[0, j] = -S * dforce[j]
+        J[1, j] = -one_minus_psi * V * dforce[j]
+        J[2, j] = (S + one_minus_psi * V) * dforce[j]
+        J[6, j] = -alpha_gamma * S / (N * N) + beta_gamma * I / (N * N)
+        J[7, j] = -alpha_eta * V / (N * N) + beta_eta * M / (N * N)
+        J[8, j] = beta_xi * V / (N * N)
+
+    J[0, 0] += -force - p_effective - mu
+    J[0, 1] += theta
+    J[0, 4] += phi
+    J[0, 5] = -gamma * dq_dM * S
+    J[0, 6] = -q * S
+
+    J[1, 0] += p_effective
+    J[1, 1] += -one_minus_psi * force - tm
+    J[1, 5] = gamma * dq_dM * S
+    J[1, 6] = q * S
+
+    J[2, 0] += force
+    J[2, 1] += one_minus_psi * force
+    J[2, 2] += -sdm
+
+    J[3, 2] = sigma
+    J[3, 3] = -rmd
+
+    J[4, 2] = delta
+    J[4, 3] = rho
+    J[4, 4] = -pm
+
+    J[5, 3] = a * k / Lambda
+    J[5, 5] = -a + eta - xi
+    J[5, 7] = M
+    J[5, 8] = -M
+
+    J[6, 0] += alpha_gamma / N
+    J[6, 3] += -beta_gamma / N
+
+    J[7, 1] += alpha_eta / N
+    J[7, 5] = -beta_eta / N
+
+    J[8, 1] += -beta_xi / N
+    J[8, 5] = alpha_xi
+
+    return J
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _rhs_p(Y, t, p, out):
+    return _rhs(Y, t, p[0], p[1], p[2], p[3], p[4], p[5], p[6], p[7], p[8], p[9], p[10], p[11], p[12],
+                p[13], p[14], p[15], p[16], p[17], p[18], p[19], p[20], p[21],
+                p[22], p[23], p[24], p[25], p[26], p[27], out)
+
+@njit(cache=True, fastmath=True)
+def _jac_p(Y, t, p):
+    return _jac(Y, t, p[0], p[1], p[2], p[3], p[4], p[5], p[6], p[7], p[8], p[9], p[10], p[11], p[12],
+                p[13], p[14], p[15], p[16], p[17], p[18], p[19], p[20], p[21],
+                p[22], p[23], p[24], p[25], p[26], p[27])
+
+# C signature expected by LSODA: void rhs(double t, double *y, double *dy, double *p).
+# As a cfunc the model is called straight from the compiled solver without building a Python frame.
+rhs_sig = types.void(types.double, types.CPointer(types.double), types.CPointer(types.double),
+                     types.CPointer(types.double))
+
+@cfunc(rhs_sig, cache=True)
+def vaccination_model_dynamic(t, y, dy, p):
+    _rhs_p(carray(y, (9,)), t, p, carray(dy, (9,)))
+
+# Fixed-step classical Runge-Kutta integrator, compiled together with the model equations.
+# t must be evenly spaced; stage derivatives are written into buffers allocated once per solve.
+# All work is done in the dtype of Y0, so float32 inputs give a single-precision solve. The numpy
+# error model lets an unstable step overflow to inf/NaN rather than raise.
+@njit(cache=True, fastmath=True, error_model='numpy')
+def rk4_solve(Y0, t, p):
+    n = t.size
+    dtype = Y0.dtype
+    out = np.empty((n, 9), dtype=dtype)
+    out[0] = Y0
+    k1 = np.empty(9, dtype=dtype)
+    k2 = np.empty(9, dtype=dtype)
+    k3 = np.empty(9, dtype=dtype)
+    k4 = np.empty(9, dtype=dtype)
+    Y = np.empty(9, dtype=dtype)
+    two = np.float32(2.0)
+    h = t[1] - t[0]
+    h2 = h / two
+    h6 = h / np.float32(6.0)
+    for i in range(n - 1):
+        Yi = out[i]
+        _rhs_p(Yi, t[i], p, k1)
+        for j in range(9):
+            Y[j] = Yi[j] + h2 * k1[j]
+        _rhs_p(Y, t[i] + h2, p, k2)
+        for j in range(9):
+            Y[j] = Yi[j] + h2 * k2[j]
+        _rhs_p(Y, t[i] + h2, p, k3)
+        for j in range(9):
+            Y[j] = Yi[j] + h * k3[j]
+        _rhs_p(Y, t[i] + h, p, k4)
+        for j in range(9):
+            out[i + 1, j] = Yi[j] + h6 * (k1[j] + two * k2[j] + two * k3[j] + k4[j])
+    return out
+
+# Independent RK4 solves for a batch of parameter sets, spread across all CPU cores
+@njit(cache=True, fastmath=True, error_model='numpy', parallel=True)
+def batch_solve(Y0s, t, params_batch):
+    n = params_batch.shape[0]
+    out = np.empty((n, t.size, 9), dtype=Y0s.dtype)
+    for i in prange(n):
+        out[i] = rk4_solve(Y0s[i], t, params_batch[i])
+    return out
+
+# Step size times the largest Jacobian eigenvalue magnitude along an RK4 solution, sampled weekly.
+# Above about 1 the fixed steps drift well away from the true curves while staying finite, so this
+# is checked rather than just looking for overflow; a solution that blew up counts as infinite.
+@njit(cache=True)
+def rk4_step_ratio(Ys, t, p):
+    if not np.isfinite(Ys).all():
+        return np.inf
+    h = t[1] - t[0]
+    ratio = 0.0
+    for i in range(0, t.size, 7):
+        J = _jac_p(Ys[i], t[i], p)
+        ratio = max(ratio, h * np.abs(np.linalg.eigvals(J.astype(np.complex128))).max())
+    return ratio
+
+RK4_MAX_STEP_RATIO = 1.0
+
+@njit(cache=True, parallel=True)
+def batch_step_ratio(Ys, t, params_batch):
+    n = params_batch.shape[0]
+    out = np.empty(n)
+    for i in prange(n):
+        out[i] = rk4_step_ratio(Ys[i], t, params_batch[i])
+    return out
+
+# Jitted JAX solver, built once per process and shared across reruns
+@st.cache_resource
+def get_jax_solver():
+    def rhs(Y, t, p):
+        S, V, C, I, R, M, gamma, eta, xi = Y
+        Lambda, mu, beta, epsilon, p0, pmax, D, psi, theta, sigma, delta, rho, d, phi, k, a, alpha_gamma, \
+        beta_gamma, alpha_eta, beta_eta, alpha_xi, beta_xi, sdm, rmd, pm, tm, one_minus_psi, dp = p
+
+        N = S + V + C + I + R
+        inv_N = 1.0 / N
+        p_effective = gamma * (p0 + dp * D * M / (1 + D * M))
+        force = beta * (epsilon * C + I) * inv_N
+
+        return jnp.stack([
+            Lambda - force * S - p_effective * S + theta * V + phi * R - mu * S,
+            p_effective * S - one_minus_psi * force * V - tm * V,
+            force * (S + one_minus_psi * V) - sdm * C,
+            sigma * C - rmd * I,
+            delta * C + rho * I - pm * R,
+            a * (k * I / Lambda - M) + eta * M - xi * M,
+            (alpha_gamma * S - beta_gamma * I) * inv_N,
+            (alpha_eta * V - beta_eta * M) * inv_N,
+            alpha_xi * M - beta_xi * V * inv_N,
+        ])
+
+    return jax.jit(lambda Y0, t, p: jax_odeint(rhs, Y0, t, p, rtol=1e-6, atol=1e-8))
+
+# Parameter-only combinations the RHS would otherwise recompute on every call; appended after
+# the 22 model parameters. Works on scalars or on per-parameter arrays (one column per parameter).
+def derived_params(params):
     Lambda, mu, beta, epsilon, p0, pmax, D, psi, theta, sigma, delta, rho, d, phi, k, a, alpha_gamma, \
     beta_gamma, alpha_eta, beta_eta, alpha_xi, beta_xi = params
+    return (sigma + delta + mu, rho + mu + d, phi + mu, theta + mu, 1.0 - psi, pmax - p0)
 
-    N = S + V + C + I + R
-    p_effective = gamma * (p0 + (pmax - p0) * D * M / (1 + D * M))
-    
-    dSdt = Lambda - beta * S * (epsilon * C + I) / N - p_effective * S + theta * V + phi * R - mu * S
-    dVdt = p_effective * S - (1 - psi) * beta * V * (epsilon * C + I) / N - (theta + mu) * V
-    dCdt = beta * (S + (1 - psi) * V) * (epsilon * C + I) / N - (sigma + delta + mu) * C
-    dIdt = sigma * C - (rho + mu + d) * I
-    dRdt = delta * C + rho * I - (phi + mu) * R
-    dMdt = a * (k * I / Lambda - M) + eta * M - xi * M
-    dGammaDt = alpha_gamma * (S / N) - beta_gamma * (I / N)
-    dEtaDt = alpha_eta * (V / N) - beta_eta * (M / N)
-    dXiDt = alpha_xi * M - beta_xi * (V / N)
-    
-    return [dSdt, dVdt, dCdt, dIdt, dRdt, dMdt, dGammaDt, dEtaDt, dXiDt]
+# Adaptive solve used for the LSODA option and whenever fixed-step RK4 is too coarse
+def lsoda_solve(params, Y0, tspan):
+    Y0 = np.asarray(Y0, dtype=np.float64)
+    p = np.asarray(params, dtype=np.float64)
+    solution, success = lsoda(vaccination_model_dynamic.address, Y0, tspan, data=p, rtol=1e-6, atol=1e-8)
+    if not success:
+        # Fall back to SciPy's LSODA, which has no per-interval step limit, with the analytic Jacobian
+        result = solve_ivp(lambda t, Y: _rhs(Y, t, *p, np.empty(9)), (tspan[0], tspan[-1]), Y0,
+                           method='LSODA', t_eval=tspan, jac=lambda t, Y: _jac(Y, t, *p),
+                           rtol=1e-6, atol=1e-8)
+        if not result.success:
+            st.warning(f'The ODE solver did not converge for these parameters; results may be inaccurate. '
+                       f'({result.message})')
+        # A failed solve stops early; pad with NaN so the solution still spans every point of tspan
+        solution = np.full((tspan.size, 9), np.nan)
+        solution[:result.y.shape[1]] = result.y.T
+    return solution
+
+# Solving the ODEs, memoized on the (hashable) inputs so identical reruns skip the solve
+@st.cache_data
+def run_solve(params, Y0, n_days, method):
+    tspan = get_tspan(n_days)
+    if method == 'RK4':
+        # Single precision is ample for plotting and halves the working set of the RK4 loop;
+        # the adaptive solvers below stay in double precision
+        t32, p32 = tspan.astype(np.float32), np.asarray(params, dtype=np.float32)
+        solution = rk4_solve(np.asarray(Y0, dtype=np.float32), t32, p32)
+        if rk4_step_ratio(solution, t32, p32) <= RK4_MAX_STEP_RATIO:
+            return solution
+        st.warning('These parameters change too quickly for the fixed-step RK4 integrator; '
+                   'the model was re-solved with LSODA.')
+        return lsoda_solve(params, Y0, tspan)
+    Y0 = np.asarray(Y0, dtype=np.float64)
+    p = np.asarray(params, dtype=np.float64)
+    if method == 'DOPRI5 (JAX)':
+        return np.asarray(get_jax_solver()(Y0, tspan, p))
+    return lsoda_solve(p, Y0, tspan)
+
+# Percentile bands of the solution when every parameter except Lambda is perturbed by up to
+# +/- variation percent; a fixed seed keeps the samples (and the cache key) reproducible
+@st.cache_data
+def run_sensitivity(params, Y0, n_days, variation, n_samples):
+    tspan = get_tspan(n_days)
+    rng = np.random.default_rng(0)
+    base = np.asarray(params, dtype=np.float32)
+    factors = rng.uniform(1 - variation / 100, 1 + variation / 100, size=(n_samples, base.size))
+    factors[:, 0] = 1.0
+    params_batch = (base * factors).astype(np.float32)
+    params_batch[:, 7] = np.minimum(params_batch[:, 7], 1.0)  # vaccine effectiveness psi <= 1
+    params_batch = np.column_stack((params_batch, *derived_params(params_batch.T))).astype(np.float32)
+    t32 = tspan.astype(np.float32)
+    Y0s = np.tile(np.asarray(Y0, dtype=np.float32), (n_samples, 1))
+    solutions = batch_solve(Y0s, t32, params_batch)
+    too_fast = np.flatnonzero(batch_step_ratio(solutions, t32, params_batch) > RK4_MAX_STEP_RATIO)
+    if too_fast.size:
+        st.warning(f'{too_fast.size} of {n_samples} perturbed parameter sets change too quickly for the '
+                   'fixed-step RK4 integrator and were re-solved with LSODA.')
+        for i in too_fast:
+            solutions[i] = lsoda_solve(params_batch[i], Y0, tspan)
+    return np.percentile(solutions, [5, 50, 95], axis=0)
 
 # Parameters tuple
 params = (Lambda, mu, beta, epsilon, p0, pmax, D, psi, theta, sigma, delta, rho, d, phi, k, a,
           alpha_gamma, beta_gamma, alpha_eta, beta_eta, alpha_xi, beta_xi)
+derived = derived_params(params)
 
 # Initial conditions vector
-Y0 = [S0, V0, C0, I0, R0, M0, gamma0, eta0, xi0]
+Y0 = (S0, V0, C0, I0, R0, M0, gamma0, eta0, xi0)
 
-# Solving the ODEs
-solution = odeint(vaccination_model_dynamic, Y0, tspan, args=(params,))
-
-# Extract solutions
-S, V, C, I, R, M, gamma, eta, xi = solution.T
+solution = run_solve(params + derived, Y0, n_days, method)
 
 # Plotting the results
 st.subheader('Model Results')
@@ -134,45 +426,60 @@ The graphs below represent the population dynamics over time. Each graph shows t
 individuals in a specific category as the disease spreads and the effects of vaccination take place.
 """)
 
-fig, axs = plt.subplots(3, 2, figsize=(12, 12))
-
-axs[0, 0].plot(tspan, S, '-b', linewidth=1.5)
-axs[0, 0].set_xlabel('Time (days)')
-axs[0, 0].set_ylabel('Susceptible Population (S)')
-axs[0, 0].set_title('Susceptible Population (S)')
-axs[0, 0].grid(True)
-
-axs[0, 1].plot(tspan, V, '-g', linewidth=1.5)
-axs[0, 1].set_xlabel('Time (days)')
-axs[0, 1].set_ylabel('Vaccinated Population (V)')
-axs[0, 1].set_title('Vaccinated Population (V)')
-axs[0, 1].grid(True)
+# Panel title and RGB colour for each plotted compartment, in state-vector order
+panels = [('Susceptible Population (S)', '0, 0, 255'),
+          ('Vaccinated Population (V)', '0, 128, 0'),
+          ('Carriers Population (C)', '255, 0, 0'),
+          ('Infected Population (I)', '191, 0, 191'),
+          ('Recovered Population (R)', '0, 191, 191')]
 
-axs[1, 0].plot(tspan, C, '-r', linewidth=1.5)
-axs[1, 0].set_xlabel('Time (days)')
-axs[1, 0].set_ylabel('Carriers Population (C)')
-axs[1, 0].set_title('Carriers Population (C)')
-axs[1, 0].grid(True)
+# All panels share one time axis, so its range and ticks are computed once and zooming or
+# panning one panel moves the others with it
+def make_panel_figure():
+    fig = make_subplots(rows=3, cols=2, specs=[[{}, {}], [{}, {}], [{}, None]], shared_xaxes='all',
+                        vertical_spacing=0.06, subplot_titles=[label for label, _ in panels])
+    for idx, (label, _) in enumerate(panels):
+        fig.update_yaxes(title_text=label, row=idx // 2 + 1, col=idx % 2 + 1)
+    # Bottom panel of each column carries the tick labels and axis title
+    for row, col in ((3, 1), (2, 2)):
+        fig.update_xaxes(title_text='Time (days)', showticklabels=True, row=row, col=col)
+    fig.update_layout(height=1000, showlegend=False)
+    return fig
 
-axs[1, 1].plot(tspan, I, '-m', linewidth=1.5)
-axs[1, 1].set_xlabel('Time (days)')
-axs[1, 1].set_ylabel('Infected Population (I)')
-axs[1, 1].set_title('Infected Population (I)')
-axs[1, 1].grid(True)
+# Figures are rebuilt only when the solution changes; Streamlit sends them to the browser as JSON
+@st.cache_data
+def build_results_figure(tspan, solution):
+    fig = make_panel_figure()
+    for idx, (label, rgb) in enumerate(panels):
+        fig.add_trace(go.Scattergl(x=tspan, y=solution[:, idx], mode='lines', name=label,
+                                   line=dict(color=f'rgb({rgb})', width=1.5)),
+                      row=idx // 2 + 1, col=idx % 2 + 1)
+    return fig
 
-axs[2, 0].plot(tspan, R, '-c', linewidth=1.5)
-axs[2, 0].set_xlabel('Time (days)')
-axs[2, 0].set_ylabel('Recovered Population (R)')
-axs[2, 0].set_title('Recovered Population (R)')
-axs[2, 0].grid(True)
-
-# Remove the empty subplot
-axs[2, 1].axis('off')
-
-plt.tight_layout()
-st.pyplot(fig)
+@st.cache_data
+def build_sensitivity_figure(tspan, bands):
+    fig = make_panel_figure()
+    for idx, (label, rgb) in enumerate(panels):
+        row, col = idx // 2 + 1, idx % 2 + 1
+        fig.add_trace(go.Scattergl(x=tspan, y=bands[0, :, idx], mode='lines', line=dict(width=0),
+                                   hoverinfo='skip'), row=row, col=col)
+        fig.add_trace(go.Scattergl(x=tspan, y=bands[2, :, idx], mode='lines', line=dict(width=0),
+                                   fill='tonexty', fillcolor=f'rgba({rgb}, 0.25)', hoverinfo='skip'),
+                      row=row, col=col)
+        fig.add_trace(go.Scattergl(x=tspan, y=bands[1, :, idx], mode='lines', name=label,
+                                   line=dict(color=f'rgb({rgb})', width=1.5)), row=row, col=col)
+    return fig
 
+st.plotly_chart(build_results_figure(tspan, solution), width='stretch')
 
+if show_sensitivity:
+    st.subheader('Sensitivity Analysis')
+    st.markdown(f"""
+The shaded regions show the 5th-95th percentile range of each population across {n_samples}
+simulations in which every parameter is perturbed by up to ±{variation}%. The solid line is the median.
+""")
+    bands = run_sensitivity(params, Y0, n_days, variation, n_samples)
+    st.plotly_chart(build_sensitivity_figure(tspan, bands), width='stretch')
 
 
 st.subheader('Understanding the Outputs')